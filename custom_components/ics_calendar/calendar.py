@@ -1,7 +1,10 @@
 """Support for ICS Calendar."""
-import copy
+import asyncio
 import logging
+from collections import OrderedDict
+from dataclasses import replace
 from datetime import datetime, timedelta
+from threading import Lock
 from typing import Optional
 
 import homeassistant.helpers.config_validation as cv
@@ -20,11 +23,14 @@ from homeassistant.const import (
     CONF_URL,
     CONF_USERNAME,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import generate_entity_id
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType
-from homeassistant.util import Throttle
+from homeassistant.helpers.update_coordinator import (
+    CoordinatorEntity,
+    DataUpdateCoordinator,
+)
 from homeassistant.util.dt import now as hanow
 
 from .calendardata import CalendarData
@@ -41,6 +47,9 @@ CONF_INCLUDE_ALL_DAY2 = "includeAllDay"
 CONF_PARSER = "parser"
 CONF_DOWNLOAD_INTERVAL = "download_interval"
 
+PARSERS = ["rie", "ics"]
+DEFAULT_PARSER = "rie"
+
 OFFSET = "!!"
 
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
@@ -63,8 +72,8 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
                             vol.Optional(CONF_USERNAME, default=""): cv.string,
                             vol.Optional(CONF_PASSWORD, default=""): cv.string,
                             vol.Optional(
-                                CONF_PARSER, default="rie"
-                            ): cv.string,
+                                CONF_PARSER, default=DEFAULT_PARSER
+                            ): vol.In(PARSERS),
                             vol.Optional(
                                 CONF_DAYS, default=1
                             ): cv.positive_int,
@@ -79,10 +88,11 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     }
 )
 
-MIN_TIME_BETWEEN_UPDATES = timedelta(minutes=15)
+# Number of recently requested time frames to keep events for
+EVENT_CACHE_SIZE = 4
 
 
-def setup_platform(
+async def async_setup_platform(
     hass: HomeAssistant,
     config: ConfigType,
     add_entities: AddEntitiesCallback,
@@ -100,7 +110,7 @@ def setup_platform(
     :type _: DiscoveryInfoType | None, optional
     """
     _LOGGER.debug("Setting up ics calendars")
-    calendar_devices = []
+    calendars = []
     for calendar in config.get(CONF_CALENDARS):
         device_data = {
             CONF_NAME: calendar.get(CONF_NAME),
@@ -116,33 +126,135 @@ def setup_platform(
             device_data[CONF_INCLUDE_ALL_DAY] = calendar.get(
                 CONF_INCLUDE_ALL_DAY
             )
+        calendars.append(device_data)
+
+    coordinators = {}
+    for device_data in calendars:
+        url = device_data[CONF_URL]
+        if url not in coordinators:
+            coordinators[url] = ICSCalendarCoordinator(
+                hass,
+                CalendarData(
+                    _LOGGER,
+                    device_data[CONF_NAME],
+                    url,
+                    timedelta(
+                        minutes=min(
+                            data[CONF_DOWNLOAD_INTERVAL]
+                            for data in calendars
+                            if data[CONF_URL] == url
+                        )
+                    ),
+                ),
+            )
+        if (
+            device_data[CONF_USERNAME] != ""
+            and device_data[CONF_PASSWORD] != ""
+        ):
+            coordinators[url].calendar_data.set_user_name_password(
+                device_data[CONF_USERNAME], device_data[CONF_PASSWORD]
+            )
+
+    await asyncio.gather(
+        *(coordinator.async_refresh() for coordinator in coordinators.values())
+    )
+
+    calendar_devices = []
+    for device_data in calendars:
         device_id = f"{device_data[CONF_NAME]}"
         entity_id = generate_entity_id(ENTITY_ID_FORMAT, device_id, hass=hass)
-        calendar_devices.append(ICSCalendarEntity(entity_id, device_data))
+        calendar_devices.append(
+            ICSCalendarEntity(
+                entity_id, device_data, coordinators[device_data[CONF_URL]]
+            )
+        )
+
+    add_entities(calendar_devices, True)
+
+
+class ICSCalendarCoordinator(DataUpdateCoordinator):
+    """Coordinator to download the data for a calendar URL.
+
+    One coordinator is shared by every calendar entity using the same URL.
+    Its data is the downloaded calendar content.  The entities also share
+    one parser for each parser name, so the content is only parsed once.
+    """
+
+    def __init__(self, hass: HomeAssistant, calendar_data: CalendarData):
+        """Construct ICSCalendarCoordinator.
 
-    add_entities(calendar_devices)
+        :param hass: Home Assistant object
+        :type hass: HomeAssistant
+        :param calendar_data: The CalendarData object for the URL
+        :type calendar_data: CalendarData
+        """
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=calendar_data.name,
+            update_interval=calendar_data.update_time,
+        )
+        self.calendar_data = calendar_data
+        self._parsers = {}
+
+    def get_parser(self, parser: str) -> tuple[ICalendarParser, Lock]:
+        """Get the shared parser with the given name.
+
+        Parsers keep state between calls, so the lock must be held while
+        using the parser.
+        :param parser: The name of the parser
+        :type parser: str
+        :return: The parser and its lock
+        :rtype: tuple[ICalendarParser, Lock]
+        """
+        if parser not in self._parsers:
+            self._parsers[parser] = (
+                ICalendarParser.get_instance(parser),
+                Lock(),
+            )
+        return self._parsers[parser]
+
+    async def _async_update_data(self) -> Optional[str]:
+        """Download the calendar data, if needed.
+
+        CalendarData only downloads once its download interval has passed;
+        otherwise, the previously downloaded data is returned.  The next
+        refresh is scheduled for when CalendarData next wants to download.
+        :return: The calendar data
+        :rtype: str
+        """
+        if await self.hass.async_add_executor_job(
+            self.calendar_data.download_calendar
+        ):
+            _LOGGER.debug("%s: Downloaded new calendar data", self.name)
+        self.update_interval = self.calendar_data.update_time
+        return self.calendar_data.get()
 
 
-class ICSCalendarEntity(CalendarEntity):
+class ICSCalendarEntity(CoordinatorEntity, CalendarEntity):
     """A CalendarEntity for an ICS Calendar."""
 
-    def __init__(self, entity_id: str, device_data):
+    def __init__(
+        self,
+        entity_id: str,
+        device_data,
+        coordinator: ICSCalendarCoordinator,
+    ):
         """Construct ICSCalendarEntity.
 
         :param entity_id: Entity id for the calendar
         :type entity_id: str
         :param device_data: dict describing the calendar
         :type device_data: dict
+        :param coordinator: The coordinator for the calendar's URL
+        :type coordinator: ICSCalendarCoordinator
         """
         _LOGGER.debug("Initializing calendar: %s", device_data[CONF_NAME])
-        self.data = ICSCalendarData(device_data)
+        super().__init__(coordinator)
+        self.data = ICSCalendarData(device_data, coordinator)
         self.entity_id = entity_id
         self._event = None
         self._name = device_data[CONF_NAME]
-        self._last_call = None
-        self._last_event_list = None
-        self._last_start_date = None
-        self._last_end_date = None
 
     @property
     def event(self) -> Optional[CalendarEvent]:
@@ -159,24 +271,19 @@ class ICSCalendarEntity(CalendarEntity):
         return self._name
 
     @property
-    def should_poll(self):
-        """Indicate if the calendar should be polled.
+    def should_poll(self) -> bool:
+        """Poll to find the current event again as time passes.
 
-        If the last call to update or get_api_events was not within the minimum
-        update time, then async_schedule_update_ha_state(True) is also called.
-        :return: True
-        :rtype: boolean
+        Polling only uses the coordinator's latest data; it does not
+        download.
         """
-        this_call = hanow()
-        if (
-            self._last_event_list is None
-            or self._last_call is None
-            or (this_call - self._last_call) > MIN_TIME_BETWEEN_UPDATES
-        ):
-            self._last_call = this_call
-            self.async_schedule_update_ha_state(True)
         return True
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Find the current event again when the coordinator refreshes."""
+        self.async_schedule_update_ha_state(True)
+
     async def async_get_events(
         self, hass: HomeAssistant, start_date: datetime, end_date: datetime
     ) -> list[CalendarEvent]:
@@ -189,34 +296,18 @@ class ICSCalendarEntity(CalendarEntity):
         :param end_date: The last starting date to consider
         :type end_date: datetime
         """
-        this_call = hanow()
-        if (
-            self._last_event_list is None
-            or self._last_call is None
-            or self._last_start_date != start_date
-            or self._last_end_date != end_date
-            or (this_call - self._last_call) > MIN_TIME_BETWEEN_UPDATES
-        ):
-            _LOGGER.debug(
-                "%s: async_get_events called; calling internal.", self.name
-            )
-            self._last_call = this_call
-            self._last_start_date = start_date
-            self._last_end_date = end_date
-            self._last_event_list = await self.data.async_get_events(
-                hass, start_date, end_date
-            )
-        return self._last_event_list
+        _LOGGER.debug("%s: async_get_events called", self.name)
+        return await self.data.async_get_events(hass, start_date, end_date)
 
-    def update(self):
+    async def async_update(self):
         """Get the current or next event."""
-        self.data.update()
-        event = copy.deepcopy(self.data.event)
+        await self.hass.async_add_executor_job(self.data.update)
+        event = self.data.event
         if event is None:
             self._event = event
             return
         [summary, offset] = extract_offset(event.summary, OFFSET)
-        event.summary = summary
+        event = replace(event, summary=summary)
         self._event = event
         self._attr_extra_state_attributes = {
             "offset_reached": is_offset_reached(
@@ -228,30 +319,32 @@ class ICSCalendarEntity(CalendarEntity):
 class ICSCalendarData:
     """Class to use the calendar ICS client object to get next event."""
 
-    def __init__(self, device_data):
-        """Set up how we are going to connect to the URL.
+    def __init__(self, device_data, coordinator: ICSCalendarCoordinator):
+        """Set up how we are going to parse the calendar data.
 
         :param device_data Information about the calendar
+        :param coordinator The coordinator providing the calendar data
         """
         self.name = device_data[CONF_NAME]
         self._days = device_data[CONF_DAYS]
         self.include_all_day = device_data[CONF_INCLUDE_ALL_DAY]
-        self.parser = ICalendarParser.get_instance(device_data[CONF_PARSER])
-        self.event = None
-        self._calendar_data = CalendarData(
-            _LOGGER,
-            self.name,
-            device_data[CONF_URL],
-            timedelta(minutes=device_data[CONF_DOWNLOAD_INTERVAL]),
+        self.parser, self._parser_lock = coordinator.get_parser(
+            device_data[CONF_PARSER]
         )
+        self.event = None
+        self._coordinator = coordinator
+        self._event_cache = OrderedDict()
+        self._event_cache_content = None
 
-        if (
-            device_data[CONF_USERNAME] != ""
-            and device_data[CONF_PASSWORD] != ""
-        ):
-            self._calendar_data.set_user_name_password(
-                device_data[CONF_USERNAME], device_data[CONF_PASSWORD]
-            )
+    def _set_content(self):
+        """Give the coordinator's calendar data to the parser.
+
+        If no data was ever downloaded, the parser is left as is.  The parser
+        keeps its calendar if the data is unchanged.
+        """
+        content = self._coordinator.data
+        if content is not None:
+            self.parser.set_content(content)
 
     async def async_get_events(
         self, hass: HomeAssistant, start_date: datetime, end_date: datetime
@@ -265,18 +358,26 @@ class ICSCalendarData:
         :param end_date: The last starting date to consider
         :type end_date: datetime
         """
-        event_list = []
-        if await hass.async_add_executor_job(
-            self._calendar_data.download_calendar
-        ):
-            _LOGGER.debug("%s: Setting calendar content", self.name)
-            self.parser.set_content(self._calendar_data.get())
+        return await hass.async_add_executor_job(
+            self._get_events, start_date, end_date
+        )
+
+    def _get_events(
+        self, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Parse and get all events in a specific time frame.
+
+        This blocks while parsing, so it must be run in an executor.  The
+        events for the last few time frames are kept until the calendar data
+        changes.
+        :param start_date: The first starting date to consider
+        :type start_date: datetime
+        :param end_date: The last starting date to consider
+        :type end_date: datetime
+        """
         try:
-            event_list = self.parser.get_event_list(
-                start=start_date,
-                end=end_date,
-                include_all_day=self.include_all_day,
-            )
+            with self._parser_lock:
+                event_list = self._get_cached_events(start_date, end_date)
         except:  # pylint: disable=W0702
             _LOGGER.error(
                 "async_get_events: %s: Failed to parse ICS!",
@@ -287,19 +388,49 @@ class ICSCalendarData:
 
         return event_list
 
-    @Throttle(MIN_TIME_BETWEEN_UPDATES)
+    def _get_cached_events(
+        self, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Get all events in a specific time frame, using the cache.
+
+        The parser lock must be held.
+        :param start_date: The first starting date to consider
+        :type start_date: datetime
+        :param end_date: The last starting date to consider
+        :type end_date: datetime
+        """
+        content = self._coordinator.data
+        if content is not self._event_cache_content:
+            self._event_cache.clear()
+            self._event_cache_content = content
+        key = (start_date, end_date)
+        if key in self._event_cache:
+            self._event_cache.move_to_end(key)
+        else:
+            self._set_content()
+            self._event_cache[key] = self.parser.get_event_list(
+                start=start_date,
+                end=end_date,
+                include_all_day=self.include_all_day,
+            )
+            if len(self._event_cache) > EVENT_CACHE_SIZE:
+                self._event_cache.popitem(last=False)
+        return list(self._event_cache[key])
+
     def update(self):
-        """Get the current or next event."""
+        """Get the current or next event.
+
+        This blocks while parsing, so it must be run in an executor.
+        """
         _LOGGER.debug("%s: Update was called", self.name)
-        if self._calendar_data.download_calendar():
-            _LOGGER.debug("%s: Setting calendar content", self.name)
-            self.parser.set_content(self._calendar_data.get())
         try:
-            self.event = self.parser.get_current_event(
-                include_all_day=self.include_all_day,
-                now=hanow(),
-                days=self._days,
-            )
+            with self._parser_lock:
+                self._set_content()
+                self.event = self.parser.get_current_event(
+                    include_all_day=self.include_all_day,
+                    now=hanow(),
+                    days=self._days,
+                )
         except:  # pylint: disable=W0702
             _LOGGER.error(
                 "update: %s: Failed to parse ICS!", self.name, exc_info=True
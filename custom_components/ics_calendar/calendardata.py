@@ -1,11 +1,14 @@
 """Provide CalendarData class."""
-from datetime import timedelta
+import re
+from datetime import datetime, timedelta
 from logging import Logger
+from typing import Optional
 from urllib.error import ContentTooShortError, HTTPError, URLError
 from urllib.request import (
     HTTPBasicAuthHandler,
     HTTPDigestAuthHandler,
     HTTPPasswordMgrWithDefaultRealm,
+    Request,
     build_opener,
     install_opener,
     urlopen,
@@ -13,6 +16,18 @@ from urllib.request import (
 
 from homeassistant.util.dt import now as hanow
 
+# Weight of the newest sample in the average time between changes
+CHANGE_ALPHA = 0.3
+# Download twice as often as the calendar is seen to change
+CHANGE_FACTOR = 0.5
+# Never wait longer than this many times min_update_time between downloads
+MAX_UPDATE_FACTOR = 4
+
+# Refreshes are scheduled on whole seconds, so may come this much early
+SCHEDULE_SLACK = timedelta(seconds=1)
+
+RE_MAX_AGE = re.compile(r"max-age=(\d+)")
+
 
 class CalendarData:
     """CalendarData class.
@@ -20,6 +35,14 @@ class CalendarData:
     The CalendarData class is used to download and cache calendar data from a
     given URL.  Use the get method to retrieve the data after constructing your
     instance.
+
+    The time between downloads starts at min_update_time, and adapts to how
+    often the calendar data is seen to change, up to MAX_UPDATE_FACTOR times
+    min_update_time.  If the server sends Cache-Control: max-age, that is
+    used instead, but never less than min_update_time.
+
+    If the server sends an ETag or Last-Modified header, later downloads
+    are conditional, so unchanged data is not sent again.
     """
 
     def __init__(
@@ -39,7 +62,13 @@ class CalendarData:
         """
         self._calendar_data = None
         self._last_download = None
+        self._last_change = None
+        self._change_interval = None
         self._min_update_time = min_update_time
+        self._max_update_time = min_update_time * MAX_UPDATE_FACTOR
+        self._update_time = min_update_time
+        self._etag = None
+        self._last_modified = None
         self.logger = logger
         self.name = name
         self.url = url
@@ -47,28 +76,43 @@ class CalendarData:
     def download_calendar(self) -> bool:
         """Download the calendar data.
 
-        This only downloads data if self.min_update_time has passed since the
-        last download.
+        This only downloads data if the current update time has passed since
+        the last download.  If the data is unchanged, the previously
+        downloaded data is kept, so it can be recognized as the same object.
 
-        returns: True if data was downloaded, otherwise False.
+        returns: True if new data was downloaded, otherwise False.
         rtype: bool
         """
         now = hanow()
         if (
             self._calendar_data is None
             or self._last_download is None
-            or (now - self._last_download) > self._min_update_time
+            or (now - self._last_download + SCHEDULE_SLACK) > self._update_time
         ):
             self._last_download = now
+            previous_data = self._calendar_data
             self._calendar_data = None
             self.logger.debug("%s: Downloading calendar data", self.name)
             try:
-                with urlopen(self.url) as conn:
-                    self._calendar_data = (
-                        conn.read().decode().replace("\0", "")
-                    )
-                return self._calendar_data is not None
+                with urlopen(self._make_request(previous_data)) as conn:
+                    data = conn.read().decode().replace("\0", "")
+                    headers = conn.headers
+                self._etag = headers.get("ETag")
+                self._last_modified = headers.get("Last-Modified")
+                changed = data != previous_data
+                self._calendar_data = data if changed else previous_data
+                self._set_update_time(
+                    now, changed, headers.get("Cache-Control")
+                )
+                return changed
             except HTTPError as http_error:
+                if http_error.code == 304 and previous_data is not None:
+                    self.logger.debug("%s: Calendar not modified", self.name)
+                    self._calendar_data = previous_data
+                    self._set_update_time(
+                        now, False, http_error.headers.get("Cache-Control")
+                    )
+                    return False
                 self.logger.error(
                     "%s: Failed to open url: %s", self.name, http_error.reason
                 )
@@ -89,6 +133,82 @@ class CalendarData:
 
         return False
 
+    def _make_request(self, previous_data: Optional[str]) -> Request:
+        """Make the request to download the calendar data.
+
+        The request is conditional on the validators of the last download,
+        unless there is no previous data to fall back on.
+        :param previous_data: The previously downloaded data, if any
+        :type previous_data: str
+        :return: The request
+        :rtype: Request
+        """
+        headers = {}
+        if previous_data is not None:
+            if self._etag is not None:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified is not None:
+                headers["If-Modified-Since"] = self._last_modified
+        return Request(self.url, headers=headers)
+
+    def _set_update_time(
+        self, now: datetime, changed: bool, cache_control: Optional[str]
+    ):
+        """Compute the time to wait before the next download.
+
+        The average time between changes is an exponentially weighted moving
+        average of the times between downloads with changed data.  While the
+        data is unchanged, the time since the last change is used if it is
+        longer.
+        :param now: The time of the download
+        :type now: datetime
+        :param changed: True if the downloaded data differs from the last
+        :type changed: bool
+        :param cache_control: The Cache-Control header, if any
+        :type cache_control: str
+        """
+        if changed:
+            if self._last_change is not None:
+                sample = now - self._last_change
+                if self._change_interval is None:
+                    self._change_interval = sample
+                else:
+                    self._change_interval = (
+                        CHANGE_ALPHA * sample
+                        + (1 - CHANGE_ALPHA) * self._change_interval
+                    )
+            self._last_change = now
+            estimate = self._change_interval
+        else:
+            estimate = now - self._last_change
+            if self._change_interval is not None:
+                estimate = max(estimate, self._change_interval)
+
+        max_age = RE_MAX_AGE.search(cache_control or "")
+        if max_age is not None:
+            self._update_time = max(
+                self._min_update_time, timedelta(seconds=int(max_age[1]))
+            )
+        elif estimate is None:
+            self._update_time = self._min_update_time
+        else:
+            self._update_time = min(
+                self._max_update_time,
+                max(self._min_update_time, estimate * CHANGE_FACTOR),
+            )
+        self.logger.debug(
+            "%s: Next download in %s", self.name, self._update_time
+        )
+
+    @property
+    def update_time(self) -> timedelta:
+        """Get the time to wait before the next download.
+
+        :return: The time between downloads
+        :rtype: timedelta
+        """
+        return self._update_time
+
     def get(self) -> str:
         """Get the calendar data that was downloaded.
 
@@ -1,5 +1,5 @@
 """Support for ics parser."""
-import re
+from bisect import bisect_left, bisect_right
 from datetime import date, datetime, timedelta
 from typing import Optional, Union
 
@@ -9,24 +9,145 @@ from ics import Calendar
 
 from ..icalendarparser import ICalendarParser
 
+PARSE_WINDOW = timedelta(days=7)
+
 
 class ParserICS(ICalendarParser):
     """Class to provide parser using ics module."""
 
     def __init__(self):
         """Construct ParserICS."""
-        self._re_method = re.compile("^METHOD:.*$", flags=re.MULTILINE)
-        self._calendar = None
+        self._content = None
+        self._window = None
+        self._selections = None
+        self._all_day = None
+        self._begin = None
+        self._end = None
+        self._summary = None
+        self._location = None
+        self._description = None
+        self._calendar_events = None
 
     def set_content(self, content: str):
         """Parse content into a calendar object.
 
         This must be called at least once before get_event_list or
-        get_current_event.
+        get_current_event.  If content is unchanged since the last call, the
+        previously parsed calendar is kept.
+
+        Only events which may fall within the next week are parsed here.
+        The first request for any other days parses the whole calendar.
+        :param content is the calendar data
+        :type content str
+        """
+        if self._content is not None and content == self._content:
+            return
+        today = date.today()
+        self._parse(content, (today, today + PARSE_WINDOW))
+        self._content = content
+
+    def _parse(self, content: str, window: Optional[tuple[date, date]]):
+        """Parse the events of content which may fall within window.
+
+        The events are sorted, as timeline would iterate over them, and kept
+        as one list per field rather than as Event objects.  Begin and end
+        times are also kept as POSIX timestamps, so events in a time range
+        can be found with a binary search and plain float comparisons.
+
+        A second selection holds only the events which are not all day
+        events, so excluding all day events needs no test per event.
         :param content is the calendar data
         :type content str
+        :param window the first and last days to parse events for, or None
+        to parse all events
+        :type window tuple[date, date]
+        """
+        if window is None:
+            calendar = Calendar(ParserICS.remove_method(content))
+        else:
+            calendar = Calendar(ParserICS.prefilter_vevents(content, *window))
+        events = sorted(
+            event for event in calendar.events if event.begin is not None
+        )
+        begins = [event.begin.float_timestamp for event in events]
+        ends = [event.end.float_timestamp for event in events]
+        self._all_day = [event.all_day for event in events]
+        timed = [
+            index for index, all_day in enumerate(self._all_day) if not all_day
+        ]
+        self._selections = {
+            True: (begins, ends, range(len(events))),
+            False: (
+                [begins[index] for index in timed],
+                [ends[index] for index in timed],
+                timed,
+            ),
+        }
+        self._begin = [event.begin for event in events]
+        self._end = [event.end for event in events]
+        # ics 0.8 uses 'summary' reliably, older versions use 'name'
+        self._summary = [event.name for event in events]
+        self._location = [event.location for event in events]
+        self._description = [event.description for event in events]
+        self._calendar_events = [None] * len(events)
+        self._window = window
+
+    def _included(
+        self, start: datetime, end: datetime, include_all_day: bool
+    ) -> list[int]:
+        """Get the indices of events which begin and end from start to end.
+
+        The events are the same, and in the same order, as
+        timeline.included would return.  If start or end falls outside of
+        the days already parsed, the whole calendar is parsed, once, so
+        browsing other days does not parse it again and again.
+        :param start the earliest time of events to include
+        :type datetime
+        :param end the latest time of events to include
+        :type datetime
+        :param include_all_day if true, all day events will be included.
+        :type boolean
+        :returns the indices of the events
+        :rtype list[int]
+        """
+        if self._window is not None and (
+            start.date() < self._window[0] or end.date() > self._window[1]
+        ):
+            self._parse(self._content, None)
+        start_ts = arrowget(start).float_timestamp
+        end_ts = arrowget(end).float_timestamp
+        begins, ends, indices = self._selections[include_all_day]
+        first = bisect_left(begins, start_ts)
+        last = bisect_right(begins, end_ts, first)
+        return [
+            indices[position]
+            for position in range(first, last)
+            if start_ts <= ends[position] <= end_ts
+        ]
+
+    def _make_event(self, index: int) -> CalendarEvent:
+        """Get the CalendarEvent for the event at index.
+
+        Each CalendarEvent is made once, when it is first returned, and then
+        shared by later calls until the events are parsed again.  Callers
+        must not modify it.
+        :param index the index of the event
+        :type int
+        :returns the CalendarEvent
+        :rtype CalendarEvent
         """
-        self._calendar = Calendar(re.sub(self._re_method, "", content))
+        calendar_event = self._calendar_events[index]
+        if calendar_event is None:
+            all_day = self._all_day[index]
+            calendar_event = CalendarEvent(
+                summary=self._summary[index],
+                start=ParserICS.get_date(self._begin[index], all_day),
+                end=ParserICS.get_date(self._end[index], all_day),
+                location=self._location[index],
+                description=self._description[index],
+            )
+            self._calendar_events[index] = calendar_event
+        return calendar_event
 
     def get_event_list(
         self, start, end, include_all_day: bool
@@ -44,34 +165,13 @@ class ParserICS(ICalendarParser):
         :returns a list of events, or an empty list
         :rtype list[CalendarEvent]
         """
-        event_list = []
-
-        if self._calendar is not None:
-            # ics 0.8 takes datetime not Arrow objects
-            # ar_start = start
-            # ar_end = end
-            ar_start = arrowget(start)
-            ar_end = arrowget(end)
-
-            for event in self._calendar.timeline.included(ar_start, ar_end):
-                if event.all_day and not include_all_day:
-                    continue
-                summary = ""
-                # ics 0.8 uses 'summary' reliably, older versions use 'name'
-                # if hasattr(event, "summary"):
-                #    summary = event.summary
-                # elif hasattr(event, "name"):
-                summary = event.name
-                calendar_event = CalendarEvent(
-                    summary=summary,
-                    start=ParserICS.get_date(event.begin, event.all_day),
-                    end=ParserICS.get_date(event.end, event.all_day),
-                    location=event.location,
-                    description=event.description,
-                )
-                event_list.append(calendar_event)
-
-        return event_list
+        if self._selections is None:
+            return []
+
+        return [
+            self._make_event(index)
+            for index in self._included(start, end, include_all_day)
+        ]
 
     def get_current_event(
         self, include_all_day: bool, now: datetime, days: int
@@ -88,39 +188,159 @@ class ParserICS(ICalendarParser):
         :type int
         :returns a CalendarEvent or None
         """
-        if self._calendar is None:
+        if self._selections is None:
             return None
 
-        temp_event = None
-        end = now + timedelta(days=days)
-        for event in self._calendar.timeline.included(
-            arrowget(now), arrowget(end)
-        ):
-            if event.all_day and not include_all_day:
-                continue
-            if ParserICS.is_event_newer(temp_event, event):
-                temp_event = event
+        # _included may parse again, so get the columns after it.
+        included = self._included(
+            now, now + timedelta(days=days), include_all_day
+        )
+        begins, ends, _ = self._selections[True]
+        temp = None
+        for index in included:
+            # Events are sorted by begin, so none of the rest can end before
+            # temp once they begin at or after its end.
+            if temp is not None and begins[index] >= ends[temp]:
+                break
+            if temp is None or ends[index] < ends[temp]:
+                temp = index
 
-        if temp_event is None:
+        if temp is None:
             return None
-        # if hasattr(event, "summary"):
-        # summary = temp_event.summary
-        # elif hasattr(event, "name"):
-        summary = temp_event.name
-        return CalendarEvent(
-            summary=summary,
-            start=ParserICS.get_date(temp_event.begin, temp_event.all_day),
-            end=ParserICS.get_date(temp_event.end, temp_event.all_day),
-            location=temp_event.location,
-            description=temp_event.description,
-        )
+        return self._make_event(temp)
 
     @staticmethod
-    def is_event_newer(check_event, event) -> bool:
-        """Determine if check_event is newer than event."""
-        return check_event is None or (
-            check_event.end > event.end and check_event.begin <= event.begin
-        )
+    def remove_method(content: str) -> str:
+        """Remove any METHOD lines from content.
+
+        METHOD usually appears at most once, near the top of the calendar, so
+        this only scans for it and splices out the matching lines.  Content
+        without a METHOD line is returned unchanged.
+        :param content is the calendar data
+        :type content str
+        :returns the calendar data without METHOD lines
+        :rtype str
+        """
+        if content.startswith("METHOD:"):
+            index = 0
+        else:
+            index = content.find("\nMETHOD:")
+            if index == -1:
+                return content
+            index += 1
+        parts = []
+        start = 0
+        while index != -1:
+            parts.append(content[start:index])
+            start = content.find("\n", index) + 1
+            if start == 0:
+                start = len(content)
+                break
+            index = content.find("\nMETHOD:", start - 1)
+            if index != -1:
+                index += 1
+        parts.append(content[start:])
+        return "".join(parts)
+
+    @staticmethod
+    def prefilter_vevents(content: str, start: date, end: date) -> str:
+        """Remove events which cannot fall between start and end.
+
+        Each VEVENT's DTSTART and DTEND lines are examined without parsing
+        the event.  Events which end before start, or begin after end, are
+        dropped; recurring events and events whose dates cannot be
+        determined are always kept.  Everything outside of the VEVENTs,
+        including any VTIMEZONEs, is kept, except for METHOD lines, which
+        the ics module may reject.  Dates are compared with a margin of one
+        day, so time zones need not be considered.  Content which is not a
+        VCALENDAR is otherwise returned unchanged, so the ics module still
+        reports it as such.
+
+        The content is scanned once; METHOD lines are only looked for
+        between the VEVENTs, where they belong.
+        :param content is the calendar data
+        :type content str
+        :param start the earliest date of events to keep
+        :type date
+        :param end the latest date of events to keep
+        :type date
+        :returns the calendar data with only the events that are kept
+        :rtype str
+        """
+        start_key = (start - timedelta(days=1)).strftime("%Y%m%d")
+        end_key = (end + timedelta(days=1)).strftime("%Y%m%d")
+        calendar = content.find("BEGIN:VCALENDAR")
+        if calendar == -1:
+            return ParserICS.remove_method(content)
+        parts = []
+        position = 0
+        begin = content.find("BEGIN:VEVENT", calendar)
+        while begin != -1:
+            finish = content.find("END:VEVENT", begin)
+            if finish == -1:
+                break
+            finish += len("END:VEVENT")
+            parts.append(ParserICS.remove_method(content[position:begin]))
+            block = content[begin:finish]
+            if ParserICS.is_vevent_in_range(block, start_key, end_key):
+                parts.append(block)
+            position = finish
+            begin = content.find("BEGIN:VEVENT", position)
+        parts.append(ParserICS.remove_method(content[position:]))
+        return "".join(parts)
+
+    @staticmethod
+    def is_vevent_in_range(block: str, start_key: str, end_key: str) -> bool:
+        """Determine if a VEVENT may fall between start_key and end_key.
+
+        :param block the text of the VEVENT
+        :type str
+        :param start_key the earliest date to consider, as YYYYMMDD
+        :type str
+        :param end_key the latest date to consider, as YYYYMMDD
+        :type str
+        :returns False only if the event certainly is not in range
+        :rtype bool
+        """
+        if "\nRRULE" in block or "\nRDATE" in block:
+            return True
+        event_start = ParserICS.peek_date(block, "\nDTSTART")
+        if event_start is None:
+            return True
+        if event_start > end_key:
+            return False
+        event_end = ParserICS.peek_date(block, "\nDTEND")
+        if event_end is None:
+            if "\nDURATION" in block:
+                return True
+            event_end = event_start
+        return event_end >= start_key
+
+    @staticmethod
+    def peek_date(block: str, name: str) -> Optional[str]:
+        """Get the date of a property in a VEVENT without parsing it.
+
+        :param block the text of the VEVENT
+        :type str
+        :param name the property name, preceded by a newline
+        :type str
+        :returns the date as YYYYMMDD, or None if it can't be determined
+        :rtype str
+        """
+        index = block.find(name)
+        if index == -1:
+            return None
+        line_end = block.find("\n", index + 1)
+        if line_end == -1:
+            line_end = len(block)
+        # Parameters may contain quoted colons, but values never do
+        colon = block.rfind(":", index, line_end)
+        if colon == -1:
+            return None
+        value = block[colon + 1 : colon + 9]
+        if len(value) != 8 or not value.isdigit():
+            return None
+        return value
 
     @staticmethod
     def get_date(arw: Arrow, is_all_day: bool) -> Union[datetime, date]:
@@ -1,5 +1,7 @@
 """Support for recurring_ical_events parser."""
+import time
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Union
 
 import recurring_ical_events as rie
@@ -15,6 +17,7 @@ class ParserRIE(ICalendarParser):
     def __init__(self):
         """Construct ParserRIE."""
         self._calendar = None
+        self._content = None
         self.oneday = timedelta(days=1)
         self.oneday2 = timedelta(hours=23, minutes=59, seconds=59)
 
@@ -22,11 +25,15 @@ class ParserRIE(ICalendarParser):
         """Parse content into a calendar object.
 
         This must be called at least once before get_event_list or
-        get_current_event.
+        get_current_event.  If content is unchanged since the last call, the
+        previously parsed calendar is kept.
         :param content is the calendar data
         :type content str
         """
+        if self._calendar is not None and content == self._content:
+            return
         self._calendar = Calendar.from_ical(content)
+        self._content = content
 
     def get_event_list(
         self, start: datetime, end: datetime, include_all_day: bool
@@ -44,25 +51,25 @@ class ParserRIE(ICalendarParser):
         :returns a list of events, or an empty list
         :rtype list[CalendarEvent]
         """
-        event_list = []
-
-        if self._calendar is not None:
-            for event in rie.of(self._calendar).between(start, end):
-                start, end, all_day = self.is_all_day(event)
-
-                if all_day and not include_all_day:
-                    continue
-
-                calendar_event = CalendarEvent(
-                    summary=event.get("SUMMARY"),
-                    start=start,
-                    end=end,
-                    location=event.get("LOCATION"),
-                    description=event.get("DESCRIPTION"),
-                )
-                event_list.append(calendar_event)
+        if self._calendar is None:
+            return []
 
-        return event_list
+        is_all_day = self.is_all_day
+        events = (
+            (event, *is_all_day(event))
+            for event in rie.of(self._calendar).between(start, end)
+        )
+        return [
+            CalendarEvent(
+                summary=event.get("SUMMARY"),
+                start=event_start,
+                end=event_end,
+                location=event.get("LOCATION"),
+                description=event.get("DESCRIPTION"),
+            )
+            for event, event_start, event_end, all_day in events
+            if include_all_day or not all_day
+        ]
 
     def get_current_event(
         self, include_all_day: bool, now: datetime, days: int
@@ -123,6 +130,26 @@ class ParserRIE(ICalendarParser):
         :returns The datetime.
         :rtype datetime
         """
+        # The local time zone is part of the key, in case it changes.  Its
+        # names alone are ambiguous (e.g. IST or CST), so add its offsets.
+        return ParserRIE.get_local_date(
+            date_time, (time.tzname, time.timezone, time.altzone)
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def get_local_date(date_time, _zone) -> datetime:
+        """Get datetime in the local time zone.
+
+        Results are cached, since the same dates are converted every time
+        events are requested.
+        :param date_time The date or datetime object
+        :type date_time datetime or date
+        :param _zone The names and offsets of the local time zone
+        :type _zone tuple
+        :returns The datetime.
+        :rtype datetime
+        """
         # Must use type here, since a datetime is also a date!
         if type(date_time) == date:  # pylint: disable=C0123
             date_time = datetime.combine(date_time, datetime.min.time())
@@ -124,6 +124,49 @@ def userpass_config():
     }
 
 
+@pytest.fixture()
+def shared_url_config():
+    """Provide fixture for config with two calendars using the same URL."""
+    return {
+        "calendar": {
+            "platform": PLATFORM,
+            "calendars": [
+                {
+                    "name": "allday",
+                    "url": "http://test.local/tests/allday.ics",
+                    "include_all_day": "true",
+                    "days": "1",
+                },
+                {
+                    "name": "noallday",
+                    "url": "http://test.local/tests/allday.ics",
+                    "include_all_day": "false",
+                    "days": "1",
+                },
+            ],
+        }
+    }
+
+
+@pytest.fixture()
+def unknown_parser_config():
+    """Provide fixture for config that uses a parser that does not exist."""
+    return {
+        "calendar": {
+            "platform": PLATFORM,
+            "calendars": [
+                {
+                    "name": "unknown_parser",
+                    "url": "http://test.local/tests/allday.ics",
+                    "include_all_day": "false",
+                    "days": "1",
+                    "parser": "icalevents",
+                }
+            ],
+        }
+    }
+
+
 # Fixtures and methods for test_parsers.py
 def datetime_hook(pairs):
     """Parse datetime values from JSON."""
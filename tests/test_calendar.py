@@ -1,6 +1,11 @@
 """Test the calendar class."""
 import copy
+from datetime import datetime, timedelta, timezone
+from email.message import Message
+from io import BytesIO
 from unittest.mock import ANY, Mock, patch
+from urllib.request import HTTPHandler, build_opener, install_opener
+from urllib.response import addinfourl
 
 import pytest
 from dateutil import parser as dtparser
@@ -9,6 +14,13 @@ from homeassistant.const import STATE_OFF, STATE_ON
 from homeassistant.helpers.template import DATE_STR_FORMAT
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as hadt
+from pytest_homeassistant_custom_component.common import (
+    async_fire_time_changed,
+)
+
+from custom_components.ics_calendar.calendar import ICSCalendarCoordinator
+from custom_components.ics_calendar.calendardata import CalendarData
+from custom_components.ics_calendar.icalendarparser import ICalendarParser
 
 pytest_plugins = "pytest_homeassistant_custom_component"
 
@@ -83,6 +95,26 @@ def _mocked_calendar_data(file_name):
     return data
 
 
+class MockHTTPHandlerMaxAge(HTTPHandler):
+    """Mock HTTPHandler that returns allday.ics with a max-age of 22.5m."""
+
+    requests = 0
+
+    def http_open(self, req):
+        """Provide http_open to return allday.ics with max-age."""
+        MockHTTPHandlerMaxAge.requests += 1
+        message = Message()
+        message["Cache-Control"] = "max-age=1350"
+        resp = addinfourl(
+            BytesIO(_mocked_calendar_data("tests/allday.ics").encode()),
+            message,
+            req.get_full_url(),
+        )
+        resp.code = 200
+        resp.msg = "OK"
+        return resp
+
+
 class TestCalendar:
     """Test Calendar class."""
 
@@ -221,6 +253,17 @@ class TestCalendar:
             userpass_config["calendar"]["calendars"][0]["password"],
         )
 
+    async def test_calendar_setup_unknown_parser(
+        self, hass, unknown_parser_config
+    ):
+        """Test setup of platform rejects unknown parsers."""
+        assert await async_setup_component(
+            hass, "calendar", unknown_parser_config
+        )
+        await hass.async_block_till_done()
+
+        assert hass.states.get("calendar.unknown_parser") is None
+
     @patch(
         "custom_components.ics_calendar.calendar.hanow",
         return_value=dtparser.parse("2021-01-03T00:00:01Z"),
@@ -267,18 +310,56 @@ class TestCalendar:
         mock_set_content.assert_called_with(
             _mocked_calendar_data("tests/allday.ics")
         )
-        mock_set_content.reset_mock()
+        assert mock_download.call_count == 1
 
         events = await get_api_events("calendar.noallday")
         assert len(events) == len(mock_event_list())
         mock_set_content.assert_called_with(
             _mocked_calendar_data("tests/allday.ics")
         )
-        mock_set_content.reset_mock()
 
+        call_count = mock_event_list.call_count
         events = await get_api_events("calendar.noallday")
+        assert mock_event_list.call_count == call_count
         assert len(events) == len(mock_event_list())
-        mock_set_content.assert_not_called()
+        assert mock_download.call_count == 1
+
+    @patch(
+        "custom_components.ics_calendar.calendardata.CalendarData.download_calendar",
+        return_value=True,
+    )
+    @patch(
+        "custom_components.ics_calendar.calendardata.CalendarData.get",
+        return_value=_mocked_calendar_data("tests/allday.ics"),
+    )
+    @patch(
+        "custom_components.ics_calendar.parsers.parser_rie.ParserRIE"
+        ".get_current_event",
+        return_value=_mocked_event(),
+    )
+    @patch(
+        "custom_components.ics_calendar.calendar.ICalendarParser.get_instance",
+        wraps=ICalendarParser.get_instance,
+    )
+    async def test_shared_url(
+        self,
+        mock_get_instance,
+        mock_event,
+        mock_get,
+        mock_download,
+        hass,
+        shared_url_config,
+    ):
+        """Test calendars with the same URL share a download and parser."""
+        assert await async_setup_component(hass, "calendar", shared_url_config)
+        await hass.async_block_till_done()
+
+        assert hass.states.get("calendar.allday").name == "allday"
+        assert hass.states.get("calendar.noallday").name == "noallday"
+        assert mock_download.call_count == 1
+        mock_get_instance.assert_called_once_with("rie")
+        mock_event.assert_any_call(include_all_day=True, now=ANY, days=ANY)
+        mock_event.assert_any_call(include_all_day=False, now=ANY, days=ANY)
 
     @pytest.mark.parametrize(
         "set_tz", ["utc", "chicago", "baghdad"], indirect=True
@@ -347,6 +428,147 @@ class TestCalendar:
         }
         assert state.state == STATE_OFF
 
+    @patch("custom_components.ics_calendar.calendardata.hanow")
+    async def test_coordinator_follows_update_time(
+        self, mock_hanow, hass, logger
+    ):
+        """Test the coordinator refreshes when CalendarData will download."""
+        mock_hanow.side_effect = [
+            dtparser.parse("2022-01-01T00:00:00"),
+            dtparser.parse("2022-01-01T00:22:29.5"),
+        ]
+        calendar_data = CalendarData(
+            logger,
+            "coordinator",
+            "http://test.local/tests/allday.ics",
+            timedelta(minutes=5),
+        )
+        coordinator = ICSCalendarCoordinator(hass, calendar_data)
+        assert coordinator.update_interval == timedelta(minutes=5)
+
+        MockHTTPHandlerMaxAge.requests = 0
+        install_opener(build_opener(MockHTTPHandlerMaxAge))
+        await coordinator.async_refresh()
+        assert coordinator.update_interval == timedelta(seconds=1350)
+        assert MockHTTPHandlerMaxAge.requests == 1
+
+        # Refreshes are scheduled on whole seconds, so may be a bit early.
+        await coordinator.async_refresh()
+        assert MockHTTPHandlerMaxAge.requests == 2
+
+    @pytest.mark.parametrize("set_tz", ["utc"], indirect=True)
+    @patch(
+        "custom_components.ics_calendar.calendar.hanow",
+        return_value=dtparser.parse("2022-01-02T23:59:30"),
+    )
+    @patch(
+        "homeassistant.util.dt.now",
+        return_value=dtparser.parse("2022-01-02T23:59:30"),
+    )
+    @patch(
+        "custom_components.ics_calendar.calendardata.CalendarData.download_calendar",
+        return_value=False,
+    )
+    @patch(
+        "custom_components.ics_calendar.calendardata.CalendarData.get",
+        return_value=_mocked_calendar_data("tests/allday.ics"),
+    )
+    @patch(
+        "custom_components.ics_calendar.parsers.parser_rie.ParserRIE"
+        ".get_current_event",
+        return_value=_mocked_event(),
+    )
+    async def test_state_follows_time(
+        self,
+        mock_event,
+        mock_get,
+        mock_download,
+        mock_dt_now,
+        mock_now,
+        hass,
+        set_tz,
+        noallday_config,
+    ):
+        """Test the state changes as time passes, without downloading."""
+        mock_dt_now.return_value = hadt.as_local(
+            dtparser.parse("2022-01-02T23:59:30")
+        )
+        mock_now.return_value = hadt.as_local(
+            dtparser.parse("2022-01-02T23:59:30")
+        )
+
+        assert await async_setup_component(hass, "calendar", noallday_config)
+        await hass.async_block_till_done()
+        assert hass.states.get("calendar.noallday").state == STATE_OFF
+        download_count = mock_download.call_count
+
+        mock_dt_now.return_value = hadt.as_local(
+            dtparser.parse("2022-01-03T00:00:30")
+        )
+        mock_now.return_value = hadt.as_local(
+            dtparser.parse("2022-01-03T00:00:30")
+        )
+        async_fire_time_changed(
+            hass, datetime.now(timezone.utc) + timedelta(seconds=61)
+        )
+        await hass.async_block_till_done()
+
+        assert hass.states.get("calendar.noallday").state == STATE_ON
+        assert mock_download.call_count == download_count
+
+    @pytest.mark.parametrize("set_tz", ["utc"], indirect=True)
+    @patch(
+        "custom_components.ics_calendar.calendar.hanow",
+        return_value=dtparser.parse("2022-01-02T23:50:01"),
+    )
+    @patch(
+        "homeassistant.util.dt.now",
+        return_value=dtparser.parse("2022-01-02T23:50:01"),
+    )
+    @patch(
+        "custom_components.ics_calendar.calendardata.CalendarData.download_calendar",
+        return_value=False,
+    )
+    @patch(
+        "custom_components.ics_calendar.calendardata.CalendarData.get",
+        return_value=_mocked_calendar_data("tests/allday.ics"),
+    )
+    @patch(
+        "custom_components.ics_calendar.parsers.parser_rie.ParserRIE"
+        ".get_current_event",
+    )
+    async def test_offset_event(
+        self,
+        mock_event,
+        mock_get,
+        mock_download,
+        mock_dt_now,
+        mock_now,
+        hass,
+        set_tz,
+        noallday_config,
+    ):
+        """Test the offset is removed without changing the parsed event."""
+        parsed_event = _mocked_event()
+        parsed_event.summary = "Test event !!-15"
+        mock_event.return_value = parsed_event
+
+        mock_dt_now.return_value = hadt.as_local(
+            dtparser.parse("2022-01-02T23:50:01")
+        )
+        mock_now.return_value = hadt.as_local(
+            dtparser.parse("2022-01-02T23:50:01")
+        )
+
+        assert await async_setup_component(hass, "calendar", noallday_config)
+        await hass.async_block_till_done()
+
+        state = hass.states.get("calendar.noallday")
+
+        assert state.attributes["message"] == "Test event"
+        assert state.attributes["offset_reached"] is True
+        assert parsed_event.summary == "Test event !!-15"
+
     @pytest.mark.parametrize(
         "set_tz", ["utc", "chicago", "baghdad"], indirect=True
     )
@@ -602,3 +824,45 @@ class TestCalendar:
 
         events = await get_api_events("calendar.noallday")
         assert len(events) == 0
+
+    @patch(
+        "custom_components.ics_calendar.calendar.hanow",
+        return_value=dtparser.parse("2022-01-03T00:00:01Z"),
+    )
+    @patch(
+        "homeassistant.util.dt.now",
+        return_value=dtparser.parse("2022-01-03T00:00:01Z"),
+    )
+    @patch(
+        "custom_components.ics_calendar.calendardata.CalendarData.download_calendar",
+        return_value=True,
+    )
+    @patch(
+        "custom_components.ics_calendar.calendardata.CalendarData.get",
+        return_value=_mocked_calendar_data("tests/allday.ics"),
+    )
+    @patch(
+        "custom_components.ics_calendar.parsers.parser_rie.ParserRIE"
+        ".set_content",
+    )
+    async def test_get_events_set_content_exception(
+        self,
+        mock_set_content,
+        mock_get,
+        mock_download,
+        mock_dt_now,
+        mock_now,
+        hass,
+        get_api_events,
+        noallday_config,
+    ):
+        """Test get_api_events when the content cannot be parsed."""
+        mock_set_content.side_effect = ValueError("Failed to parse")
+        assert await async_setup_component(hass, "calendar", noallday_config)
+        await hass.async_block_till_done()
+
+        state = hass.states.get("calendar.noallday")
+        assert state.state == STATE_OFF
+
+        events = await get_api_events("calendar.noallday")
+        assert len(events) == 0
@@ -1,9 +1,15 @@
 """Test the CalendarData class."""
 from datetime import timedelta
+from email.message import Message
 from io import BytesIO
 from unittest.mock import patch
 from urllib.error import ContentTooShortError, HTTPError, URLError
-from urllib.request import HTTPHandler, build_opener, install_opener
+from urllib.request import (
+    HTTPHandler,
+    build_opener,
+    install_opener,
+    urlopen,
+)
 from urllib.response import addinfourl
 
 from dateutil import parser as dtparser
@@ -15,6 +21,8 @@ BINARY_CALENDAR_DATA_2 = b"2 calendar data"
 CALENDAR_DATA = "calendar data"
 CALENDAR_DATA_2 = "2 calendar data"
 CALENDAR_NAME = "TESTcalendar"
+ETAG = '"1234"'
+LAST_MODIFIED = "Sat, 01 Jan 2022 00:00:00 GMT"
 TEST_URL = "http://127.0.0.1/test/allday.ics"
 
 
@@ -23,9 +31,12 @@ def set_calendar_data(calendar_data: CalendarData, data: str):
     calendar_data._calendar_data = data  # pylint: disable=W0212
 
 
-def mock_response(req, data: str):
-    """Return an HttpResponse object with the given data."""
-    resp = addinfourl(BytesIO(data), "message", req.get_full_url())
+def mock_response(req, data: str, headers: dict = None):
+    """Return an HttpResponse object with the given data and headers."""
+    message = Message()
+    for name, value in (headers or {}).items():
+        message[name] = value
+    resp = addinfourl(BytesIO(data), message, req.get_full_url())
     resp.code = 200
     resp.msg = "OK"
     return resp
@@ -79,6 +90,37 @@ class MockHTTPHandler2(HTTPHandler):
         return mock_response(req, BINARY_CALENDAR_DATA_2)
 
 
+class MockHTTPHandlerMaxAge(HTTPHandler):
+    """Mock HTTPHandler that returns BINARY_CALENDAR_DATA with max-age."""
+
+    def http_open(self, req):
+        """Provide http_open to return BINARY_CALENDAR_DATA with max-age."""
+        return mock_response(
+            req,
+            BINARY_CALENDAR_DATA,
+            {"Cache-Control": "public, max-age=3600"},
+        )
+
+
+class MockHTTPHandlerValidators(HTTPHandler):
+    """Mock HTTPHandler that returns 304 for a matching If-None-Match."""
+
+    requests = []
+
+    def http_open(self, req):
+        """Provide http_open to return BINARY_CALENDAR_DATA or 304."""
+        MockHTTPHandlerValidators.requests.append(req)
+        if req.get_header("If-none-match") == ETAG:
+            raise HTTPError(
+                req.get_full_url(), 304, "Not Modified", Message(), None
+            )
+        return mock_response(
+            req,
+            BINARY_CALENDAR_DATA,
+            {"ETag": ETAG, "Last-Modified": LAST_MODIFIED},
+        )
+
+
 class TestCalendarData:
     """Test the CalendarData class."""
 
@@ -212,3 +254,84 @@ class TestCalendarData:
         install_opener(opener)
         assert not calendar_data.download_calendar()
         assert calendar_data.get() == CALENDAR_DATA
+
+    @patch(
+        "custom_components.ics_calendar.calendardata.urlopen",
+        wraps=urlopen,
+    )
+    @patch("custom_components.ics_calendar.calendardata.hanow")
+    def test_download_honors_max_age(self, mock_hanow, mock_urlopen, logger):
+        """Test that Cache-Control max-age sets the time between downloads."""
+        mock_hanow.side_effect = [
+            dtparser.parse("2022-01-01T00:00:00"),
+            dtparser.parse("2022-01-01T00:59:59"),
+            dtparser.parse("2022-01-01T01:00:01"),
+        ]
+        calendar_data = CalendarData(
+            logger, CALENDAR_NAME, TEST_URL, timedelta(minutes=5)
+        )
+        install_opener(build_opener(MockHTTPHandlerMaxAge))
+        assert calendar_data.download_calendar()
+        calendar_data.download_calendar()
+        assert mock_urlopen.call_count == 1
+        calendar_data.download_calendar()
+        assert mock_urlopen.call_count == 2
+
+    @patch(
+        "custom_components.ics_calendar.calendardata.urlopen",
+        wraps=urlopen,
+    )
+    @patch("custom_components.ics_calendar.calendardata.hanow")
+    def test_download_adapts_to_unchanged_data(
+        self, mock_hanow, mock_urlopen, logger
+    ):
+        """Test that unchanged data increases the time between downloads."""
+        mock_hanow.side_effect = [
+            dtparser.parse("2022-01-01T00:00:00"),
+            dtparser.parse("2022-01-01T00:05:01"),
+            dtparser.parse("2022-01-01T00:30:00"),
+            dtparser.parse("2022-01-01T00:39:59"),
+            dtparser.parse("2022-01-01T00:50:00"),
+            dtparser.parse("2022-01-01T01:10:01"),
+            dtparser.parse("2022-01-01T01:25:00"),
+        ]
+        calendar_data = CalendarData(
+            logger, CALENDAR_NAME, TEST_URL, timedelta(minutes=5)
+        )
+        install_opener(build_opener(MockHTTPHandler))
+        assert calendar_data.download_calendar()
+        # Unchanged for 5 minutes: wait 5 minutes
+        assert not calendar_data.download_calendar()
+        assert mock_urlopen.call_count == 2
+        # Unchanged for 30 minutes: wait 15 minutes
+        calendar_data.download_calendar()
+        calendar_data.download_calendar()
+        assert mock_urlopen.call_count == 3
+        # Unchanged for 50 minutes: wait the maximum, 20 minutes
+        calendar_data.download_calendar()
+        calendar_data.download_calendar()
+        calendar_data.download_calendar()
+        assert mock_urlopen.call_count == 5
+        assert calendar_data.get() == CALENDAR_DATA
+
+    @patch("custom_components.ics_calendar.calendardata.hanow")
+    def test_download_not_modified(self, mock_hanow, logger):
+        """Test that validators are sent, and 304 keeps the old data."""
+        mock_hanow.side_effect = [
+            dtparser.parse("2022-01-01T00:00:00"),
+            dtparser.parse("2022-01-01T00:05:01"),
+        ]
+        calendar_data = CalendarData(
+            logger, CALENDAR_NAME, TEST_URL, timedelta(minutes=5)
+        )
+        MockHTTPHandlerValidators.requests = []
+        install_opener(build_opener(MockHTTPHandlerValidators))
+        assert calendar_data.download_calendar()
+        data = calendar_data.get()
+        assert not calendar_data.download_calendar()
+        assert calendar_data.get() is data
+
+        first, second = MockHTTPHandlerValidators.requests
+        assert first.get_header("If-none-match") is None
+        assert second.get_header("If-none-match") == ETAG
+        assert second.get_header("If-modified-since") == LAST_MODIFIED
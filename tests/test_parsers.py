@@ -1,4 +1,9 @@
 """Test the parsers, especially for past issues."""
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+import arrow
 import ics
 import pytest
 from dateutil import parser as dtparser
@@ -312,3 +317,221 @@ class TestParsers:
         )
         pytest.helpers.assert_event_list_size(1, event_list)
         pytest.helpers.compare_event_list(expected_data, event_list)
+
+    @pytest.mark.parametrize(
+        "which_parser,calendar_class",
+        [
+            ("rie_parser", "parser_rie.Calendar.from_ical"),
+            ("ics_parser", "parser_ics.Calendar"),
+        ],
+    )
+    @pytest.mark.parametrize("file_name", ["issue45.ics"])
+    def test_set_content_reuses_calendar(
+        self, parser, calendar_class, calendar_data, expected_data
+    ):
+        """Test unchanged content is not parsed again."""
+        parser.set_content(calendar_data)
+        parser.get_current_event(
+            True, dtparser.parse("2022-02-28T05:00:00-05:00"), 1
+        )
+        with patch(
+            f"custom_components.ics_calendar.parsers.{calendar_class}"
+        ) as mock_calendar:
+            parser.set_content(calendar_data)
+            parser.get_current_event(
+                True, dtparser.parse("2022-02-28T05:15:00-05:00"), 1
+            )
+            parser.set_content(calendar_data)
+            current_event = parser.get_current_event(
+                True, dtparser.parse("2022-02-28T05:30:00-05:00"), 1
+            )
+        mock_calendar.assert_not_called()
+        pytest.helpers.compare_event_list(expected_data, [current_event])
+
+    @pytest.mark.parametrize(
+        "content,expected",
+        [
+            (
+                "BEGIN:VCALENDAR\nEND:VCALENDAR",
+                "BEGIN:VCALENDAR\nEND:VCALENDAR",
+            ),
+            ("METHOD:PUBLISH\nBEGIN:VCALENDAR", "BEGIN:VCALENDAR"),
+            (
+                "BEGIN:VCALENDAR\r\nMETHOD:PUBLISH\r\nEND:VCALENDAR\r\n",
+                "BEGIN:VCALENDAR\r\nEND:VCALENDAR\r\n",
+            ),
+            ("BEGIN:VCALENDAR\nMETHOD:PUBLISH", "BEGIN:VCALENDAR\n"),
+        ],
+    )
+    def test_remove_method(self, ics_parser, content, expected):
+        """Test removing METHOD lines for the ics parser."""
+        assert ics_parser.remove_method(content) == expected
+
+    @pytest.mark.parametrize("file_name", ["issue34.ics"])
+    def test_prefilter_vevents(self, ics_parser, calendar_data):
+        """Test prefilter_vevents drops only events outside the range."""
+        start = dtparser.parse("2021-03-01T00:00:00")
+        end = dtparser.parse("2021-03-31T23:59:59")
+        content = ics_parser.prefilter_vevents(
+            calendar_data, start.date(), end.date()
+        )
+        assert content.count("BEGIN:VEVENT") < calendar_data.count(
+            "BEGIN:VEVENT"
+        )
+        assert content.count("BEGIN:VTIMEZONE") == calendar_data.count(
+            "BEGIN:VTIMEZONE"
+        )
+        assert "METHOD:" in calendar_data
+        assert "METHOD:" not in content
+
+        expected = [
+            {
+                "summary": event.name,
+                "start": event.begin.datetime,
+                "end": event.end.datetime,
+            }
+            for event in ics.Calendar(
+                ics_parser.remove_method(calendar_data)
+            ).timeline.included(arrow.get(start), arrow.get(end))
+        ]
+        ics_parser.set_content(calendar_data)
+        event_list = ics_parser.get_event_list(start, end, True)
+        pytest.helpers.assert_event_list_size(len(expected), event_list)
+        pytest.helpers.compare_event_list(expected, event_list)
+
+    @pytest.mark.parametrize("file_name", ["issue34.ics"])
+    def test_other_days_parse_once(self, ics_parser, calendar_data):
+        """Test the whole calendar is parsed once for days not yet parsed."""
+        with patch(
+            "custom_components.ics_calendar.parsers.parser_ics.Calendar",
+            wraps=ics.Calendar,
+        ) as mock_calendar:
+            ics_parser.set_content(calendar_data)
+            assert mock_calendar.call_count == 1
+            for month in range(3, 13):
+                start = dtparser.parse(f"2021-{month:02}-01T00:00:00+00:00")
+                ics_parser.get_event_list(start, start + timedelta(28), True)
+            assert mock_calendar.call_count == 2
+
+    @pytest.mark.parametrize("file_name", ["issue34.ics"])
+    def test_events_are_shared(self, ics_parser, calendar_data):
+        """Test the same CalendarEvent objects are returned again."""
+        start = dtparser.parse("2021-03-01T00:00:00+00:00")
+        end = dtparser.parse("2021-03-31T23:59:59+00:00")
+        ics_parser.set_content(calendar_data)
+        event_list = ics_parser.get_event_list(start, end, True)
+        assert event_list
+        for first, second in zip(
+            event_list, ics_parser.get_event_list(start, end, True)
+        ):
+            assert first is second
+
+    @pytest.mark.parametrize("include_all_day", [True, False])
+    @pytest.mark.parametrize("file_name", ["issue34.ics"])
+    def test_current_event_matches_timeline(
+        self, ics_parser, calendar_data, include_all_day
+    ):
+        """Test get_current_event picks the event timeline would."""
+        calendar = ics.Calendar(ics_parser.remove_method(calendar_data))
+        ics_parser.set_content(calendar_data)
+        for day in range(1, 31, 3):
+            now = dtparser.parse(f"2021-03-{day:02}T12:00:00+00:00")
+            expected = None
+            for event in calendar.timeline.included(
+                arrow.get(now), arrow.get(now).shift(days=7)
+            ):
+                if event.all_day and not include_all_day:
+                    continue
+                if expected is None or (
+                    expected.end > event.end and expected.begin <= event.begin
+                ):
+                    expected = event
+            event = ics_parser.get_current_event(include_all_day, now, 7)
+            if expected is None:
+                assert event is None
+            else:
+                assert event.summary == expected.name
+                assert event.start == expected.begin.datetime
+                assert event.end == expected.end.datetime
+
+    @pytest.mark.parametrize(
+        "block,expected",
+        [
+            ("BEGIN:VEVENT\nDTSTART:20210310T070000Z\nEND:VEVENT", True),
+            ("BEGIN:VEVENT\nDTSTART:20210410T070000Z\nEND:VEVENT", False),
+            (
+                "BEGIN:VEVENT\nDTSTART;VALUE=DATE:20210201\n"
+                "DTEND;VALUE=DATE:20210202\nEND:VEVENT",
+                False,
+            ),
+            (
+                "BEGIN:VEVENT\nDTSTART;VALUE=DATE:20210301\n"
+                "DTEND;VALUE=DATE:20210302\nEND:VEVENT",
+                True,
+            ),
+            (
+                'BEGIN:VEVENT\nDTSTART;TZID="(UTC+01:00) Amsterdam":'
+                '20210201T070000\nDTEND;TZID="(UTC+01:00) Amsterdam":'
+                "20210201T080000\nEND:VEVENT",
+                False,
+            ),
+            (
+                "BEGIN:VEVENT\nDTSTART:20210201T070000Z\nDURATION:P60D\n"
+                "END:VEVENT",
+                True,
+            ),
+            (
+                "BEGIN:VEVENT\nDTSTART:20210201T070000Z\n"
+                "RRULE:FREQ=WEEKLY\nEND:VEVENT",
+                True,
+            ),
+            (
+                "BEGIN:VEVENT\nDTSTART:20210201T070000Z\n"
+                "RDATE:20210310T070000Z\nEND:VEVENT",
+                True,
+            ),
+            ("BEGIN:VEVENT\nSUMMARY:No dates\nEND:VEVENT", True),
+        ],
+    )
+    def test_is_vevent_in_range(self, ics_parser, block, expected):
+        """Test is_vevent_in_range for the ics parser."""
+        assert (
+            ics_parser.is_vevent_in_range(block, "20210228", "20210401")
+            == expected
+        )
+
+    @pytest.mark.parametrize(
+        "block,expected",
+        [
+            ("BEGIN:VEVENT\nDTSTART:20210310T070000Z\n", "20210310"),
+            ("BEGIN:VEVENT\nDTSTART;VALUE=DATE:20210310\n", "20210310"),
+            (
+                'BEGIN:VEVENT\nDTSTART;TZID="(UTC+01:00) Amsterdam":'
+                "20210310T070000\n",
+                "20210310",
+            ),
+            ("BEGIN:VEVENT\nDTSTART:2021\n", None),
+            ("BEGIN:VEVENT\nSUMMARY:DTSTART\n", None),
+        ],
+    )
+    def test_peek_date(self, ics_parser, block, expected):
+        """Test peek_date for the ics parser."""
+        assert ics_parser.peek_date(block, "\nDTSTART") == expected
+
+    def test_get_date_is_cached(self, rie_parser):
+        """Test get_date reuses converted dates for the rie parser."""
+        date_time = dtparser.parse("2022-01-03T05:00:00Z")
+        first = rie_parser.get_date(date_time)
+        hits = rie_parser.get_local_date.cache_info().hits
+        assert rie_parser.get_date(date_time) == first
+        assert rie_parser.get_local_date.cache_info().hits == hits + 1
+        assert first == date_time.astimezone()
+
+    def test_get_date_cache_follows_time_zone(self, rie_parser):
+        """Test a time zone with the same names is not served from cache."""
+        date_time = dtparser.parse("2022-01-03T05:00:00Z")
+        rie_parser.get_date(date_time)
+        misses = rie_parser.get_local_date.cache_info().misses
+        with patch("time.timezone", time.timezone + 3600):
+            rie_parser.get_date(date_time)
+        assert rie_parser.get_local_date.cache_info().misses == misses + 1